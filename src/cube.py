@@ -5,7 +5,13 @@ Classes for simulating a Rubik's Cube.
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from enum import Enum, auto
+from enum import Enum, IntEnum
+from functools import lru_cache
+from typing import Callable, Iterator
+
+import numpy as np
+
+from . import cube_kernels
 
 __author__ = "Lachlan Tait"
 
@@ -14,7 +20,9 @@ class Cube(ABC):
     """
     A Rubik's Cube.
 
-    Represented internally as a 3-dimensional list of Colour values.
+    Represented internally as a 3-dimensional NumPy array of shape (6, size, size), where each square stores the
+    value of its Colour as a uint8. Each face is its own C-contiguous (size, size) block within that array,
+    and a view of each face is kept so that operations on a single face never touch another face's memory.
     This class is abstract so that subclasses can provide their own method of displaying the cube.
 
     Faces are indexed like so:
@@ -39,7 +47,15 @@ class Cube(ABC):
     where rotate_x means rotate around the x-axis, etc.
     """
 
+    # No per-instance __dict__, as searches can create a great many cubes. Subclasses should declare their own slots.
+    __slots__ = ("_size", "_cube", "_scratch", "_flat_cube", "_flat_scratch", "_faces", "_scratch_faces",
+                 "_move_permutations")
+
     FACES_IN_A_CUBE = 6
+    AXES = "xyz"
+    MAX_ENCODED_INDEX = (np.iinfo(np.uint16).max >> 3) + 1  # The largest column/row that encode_move can encode
+    # Cubes up to this size perform rotations as a precomputed permutation of all their squares (see _apply_move)
+    MAX_PERMUTATION_SIZE = 16
 
     def __init__(self, size: int, *,
                  cube_list: list[list[list[Colour]]] | None = None,
@@ -53,7 +69,7 @@ class Cube(ABC):
 
         :param size: The cube created will have faces that are <size>x<size> (e.g. (3x3)).
             Must be >= 1.
-        :param cube_list: If provided, the cube is initialised to this 3-dimensional list.
+        :param cube_list: If provided, the cube is initialised to this 3-dimensional list of Colours.
         :param string_repr: If provided (and <cube> is not),
             the cube is initialised using this string representation of a cube.
         :raises ValueError: If a non-positive size is given.
@@ -62,108 +78,134 @@ class Cube(ABC):
             raise ValueError("Invalid size")
         self._size: int = size
 
-        self._cube: list[list[list[Colour]]] | None = None
+        self._set_buffers(np.empty((Cube.FACES_IN_A_CUBE, size, size), dtype=np.uint8))
+        self._move_permutations: dict[tuple[str, int, bool], np.ndarray] | None = None
+        if size <= Cube.MAX_PERMUTATION_SIZE:
+            self._move_permutations = cube_kernels.get_move_permutations(size)
         if cube_list:
-            self._cube = cube_list
+            self.set_cube(cube_list)
         elif string_repr:
-            self._cube = Cube.create_cube_from_string_representation(self._size, string_repr)
+            self._cube[:] = Cube.create_cube_from_string_representation(self._size, string_repr)
         else:
             self.reset()  # Sets the cube to the initial, solved state
 
+    def _set_buffers(self, cube: np.ndarray) -> None:
+        """
+        Makes the array given the cube's squares, along with a new scratch buffer and the views of both.
+
+        The cube is double-buffered: rotations read from self._cube and write into self._scratch,
+        then the two buffers (and their flat and face views) are swapped.
+        The flat views are kept so that the rotations don't have to reshape the buffers each time.
+
+        :param cube: A C-contiguous (6, size, size) array to use as the cube's squares.
+        """
+        self._cube: np.ndarray = cube
+        self._scratch: np.ndarray = np.empty_like(cube)
+        self._flat_cube: np.ndarray = cube.reshape(-1)
+        self._flat_scratch: np.ndarray = self._scratch.reshape(-1)
+        self._faces: tuple[np.ndarray, ...] = tuple(cube)
+        self._scratch_faces: tuple[np.ndarray, ...] = tuple(self._scratch)
+
     def __len__(self):
         """ Returns the amount of squares in the cube. """
         return Cube.FACES_IN_A_CUBE * self._size * self._size
 
     def __eq__(self, other: Cube) -> bool:
-        return self._size == other._size and self._cube == other._cube
+        return self._size == other._size and np.array_equal(self._cube, other._cube)
+
+    def __hash__(self) -> int:
+        """
+        Hashes the current state of the cube, so that cubes can be stored in sets and used as dict keys.
+        The hash changes whenever the cube is rotated, so don't rotate a cube while it's in a set or dict.
+        """
+        return hash(self._cube.tobytes())
+
+    def __iter__(self) -> Iterator[Colour]:
+        """ Iterates through every square in the cube in order. """
+        return map(_COLOURS_BY_VALUE.__getitem__, self._flat_cube.tolist())
 
-    def __iter__(self):
-        return CubeIterator(self)
+    def clone(self) -> Cube:
+        """
+        Returns an independent copy of the cube, of the same class.
+
+        This copies the array of Colour values directly rather than going through __init__ or a list of Colours,
+        so it should be preferred over copy.deepcopy when many cubes need to be copied (e.g. during a search).
+        Subclasses with slots of their own should extend this to copy them too.
+        """
+        clone = type(self).__new__(type(self))  # Skips __init__, which would build a new solved cube first
+        clone._size = self._size
+        clone._set_buffers(self._cube.copy())
+        clone._move_permutations = self._move_permutations  # Shared and never modified
+        return clone
 
     def get_size(self) -> int:
         return self._size
 
-    def get_cube(self) -> list[list[list[Colour]]]:
+    def get_cube(self) -> np.ndarray:
+        """
+        Returns the (6, size, size) array of Colour values representing the cube.
+
+        The cube is double-buffered, so the array returned is only valid until the cube is next rotated.
+        """
         return self._cube
 
-    def get_row(self, face: int, row: int) -> list[Colour]:
+    def get_face(self, face: int) -> np.ndarray:
         """
-        Given a face and a row number, returns a list representing that row.
+        Given a face, returns a (size, size) view of the Colour values on that face.
+        Like get_cube, the view is only valid until the cube is next rotated.
+
+        :param face: The face of the cube, 0-indexed.
+        """
+        return self._faces[face]
+
+    def get_row(self, face: int, row: int) -> np.ndarray:
+        """
+        Given a face and a row number, returns an array of Colour values representing that row.
+
+        The array is a view of the cube, so it should be copied if it needs to outlive the next rotation.
 
         :param face: The face of the cube, 0-indexed.
         :param row: The row within the face, 0-indexed.
         """
-        return self._cube[face][row]
+        return self._faces[face][row]
 
-    def get_column(self, face: int, column: int) -> list[Colour]:
+    def get_column(self, face: int, column: int) -> np.ndarray:
         """
-        Given a face and a column number, returns a list representing that column.
+        Given a face and a column number, returns an array of Colour values representing that column.
 
-        The column list will be from top to bottom.
+        The column will be from top to bottom.
+        The array is a (strided) view of the cube, so it should be copied if it needs to outlive the next rotation.
 
         :param face: The face of the cube, 0-indexed.
         :param column: The column within the face, 0-indexed.
         """
-        column_list = []
-        for row in range(self._size):
-            column_list.append(self._cube[face][row][column])
-        return column_list
+        return self._faces[face][:, column]
 
     def get_square(self, face: int, row: int, column: int) -> Colour:
-        return self._cube[face][row][column]
+        return _COLOURS_BY_VALUE[self._faces[face][row, column]]
 
     def get_string_representation(self) -> str:
         """
         Returns a string representing the cube.
         e.g. "GGGGGGGGGRRRRRRRRRBBBBBBBBBOOOOOOOOOWWWWWWYYYYYY" is a solved cube.
         """
-        output = ""
-        for square in self:
-            output += Cube.get_string_from_colour(square)
-        return output
+        return self._cube.tobytes().translate(_VALUE_TO_CHAR_TABLE).decode("ascii")
 
     def set_cube(self, cube: list[list[list[Colour]]]):
         """
-        Sets the cube to the 3-dimensional list given.
+        Sets the cube to the 3-dimensional list of Colours given.
         Warning: cube is not checked to see if it is a valid/solvable cube.
-        """
-        self._cube = cube
-
-    def _set_row(self, face: int, row: int, new_row_list: list[Colour], reverse: bool = False) -> None:
-        """
-        Given a face and row number, sets that row using the new_row_list provided.
-
-        :param face: The face of the cube, 0-indexed.
-        :param row: The row within the face, 0-indexed.
-        :param new_row_list: A list representing a row, the row will be set using this list.
-        :param reverse: If true, sets the row in reverse order.
-        """
-        if not reverse:
-            self._cube[face][row] = new_row_list
-        else:
-            for i in range(self._size):
-                self._cube[face][row][i] = new_row_list[self._size - 1 - i]
-
-    def _set_column(self, face: int, column: int, new_column_list: list[Colour], reverse: bool = False) -> None:
-        """
-        Given a face and column number, sets that column using the new_column_list provided.
 
-        :param face: The face of the cube, 0-indexed.
-        :param column: The column within the face, 0-indexed.
-        :param new_column_list: A list representing a column, the column will be set using this list.
-            This list should have the top-most square first.
-        :param reverse: If true, sets the column in reverse order.
+        :raises ValueError: If the list isn't 6 faces of <size>x<size> Colours.
         """
-        if not reverse:
-            for row in range(self._size):
-                self._cube[face][row][column] = new_column_list[row]
-        else:
-            for row in range(self._size):
-                self._cube[face][row][column] = new_column_list[self._size - 1 - row]
+        new_cube = Cube.create_cube_from_list(cube)
+        if new_cube.shape != self._cube.shape:
+            raise ValueError("Invalid cube size")
+        self._cube[:] = new_cube
 
     def reset(self) -> None:
         """ Resets the cube back to the solved state. """
-        self._cube = Cube.create_solved_cube(self._size)
+        np.copyto(self._cube, _get_solved_cube(self._size))
 
     def rotate_x(self, column: int, direction: ColumnMove) -> None:
         """
@@ -175,32 +217,7 @@ class Cube(ABC):
         """
         if not 1 <= column <= self._size:
             raise ValueError("Invalid column")
-        column -= 1  # Change column to 0-indexed.
-
-        # Rotate the column
-        face1_column = self.get_column(1, column)
-        face4_column = self.get_column(4, column)
-        face3_column = self.get_column(3, self._size - 1 - column)  # Get the opposite column
-        face5_column = self.get_column(5, column)
-        if direction == ColumnMove.UP:
-            self._set_column(1, column, face5_column)
-            self._set_column(4, column, face1_column)
-            self._set_column(3, self._size - 1 - column, face4_column, reverse=True)  # Set the opposite column
-            self._set_column(5, column, face3_column, reverse=True)
-        else:  # direction == ColumnMove.DOWN
-            self._set_column(1, column, face4_column)
-            self._set_column(4, column, face3_column, reverse=True)
-            self._set_column(3, self._size - 1 - column, face5_column, reverse=True)  # Set the opposite column
-            self._set_column(5, column, face1_column)
-
-        # Leftmost column was rotated, so face 0 was rotated
-        if column == 0:
-            rotate_face_direction = RotateMove.ANTICLOCKWISE if direction == ColumnMove.UP else RotateMove.CLOCKWISE
-            self._rotate_face(0, rotate_face_direction)
-        # Rightmost column was rotated, so face 2 was rotated
-        elif column == self._size - 1:
-            rotate_face_direction = RotateMove.CLOCKWISE if direction == ColumnMove.UP else RotateMove.ANTICLOCKWISE
-            self._rotate_face(2, rotate_face_direction)
+        self.rotate_x_unchecked(column - 1, direction is ColumnMove.UP)
 
     def rotate_y(self, row: int, direction: RowMove) -> None:
         """
@@ -212,32 +229,7 @@ class Cube(ABC):
         """
         if not 1 <= row <= self._size:
             raise ValueError("Invalid row")
-        row -= 1  # Change row to 0-indexed.
-
-        # Rotate the row
-        face0_row = self.get_row(0, row)
-        face1_row = self.get_row(1, row)
-        face2_row = self.get_row(2, row)
-        face3_row = self.get_row(3, row)
-        if direction == RowMove.LEFT:
-            self._set_row(0, row, face1_row)
-            self._set_row(1, row, face2_row)
-            self._set_row(2, row, face3_row)
-            self._set_row(3, row, face0_row)
-        else:  # direction == RowMove.RIGHT
-            self._set_row(0, row, face3_row)
-            self._set_row(1, row, face0_row)
-            self._set_row(2, row, face1_row)
-            self._set_row(3, row, face2_row)
-
-        # Top row was rotated, so top face was rotated
-        if row == 0:
-            rotate_face_direction = RotateMove.CLOCKWISE if direction == RowMove.LEFT else RotateMove.ANTICLOCKWISE
-            self._rotate_face(4, rotate_face_direction)
-        # Bottom row was rotated, so bottom face was rotated
-        elif row == self._size - 1:
-            rotate_face_direction = RotateMove.ANTICLOCKWISE if direction == RowMove.LEFT else RotateMove.CLOCKWISE
-            self._rotate_face(5, rotate_face_direction)
+        self.rotate_y_unchecked(row - 1, direction is RowMove.LEFT)
 
     def rotate_z(self, column: int, direction: ColumnMove) -> None:
         """
@@ -249,76 +241,176 @@ class Cube(ABC):
         """
         if not 1 <= column <= self._size:
             raise ValueError("Invalid column")
-        column -= 1  # Change column to 0-indexed.
-
-        # Rotate the column
-        # Some 'columns' here are actually stored as rows
-        face2_column = self.get_column(2, column)
-        face4_column = self.get_row(4, self._size - 1 - column)  # Get opposite column
-        face0_column = self.get_column(0, self._size - 1 - column)  # Get opposite column
-        face5_column = self.get_row(5, column)
-        if direction == ColumnMove.UP:
-            self._set_column(2, column, face5_column, reverse=True)
-            self._set_row(4, self._size - 1 - column, face2_column)  # Set opposite column
-            self._set_column(0, self._size - 1 - column, face4_column, reverse=True)  # Set opposite column
-            self._set_row(5, column, face0_column)
-        else:  # direction == ColumnMove.DOWN
-            self._set_column(2, column, face4_column)
-            self._set_row(4, self._size - 1 - column, face0_column, reverse=True)  # Set opposite column
-            self._set_column(0, self._size - 1 - column, face5_column)  # Set opposite column
-            self._set_row(5, column, face2_column, reverse=True)
-
-        # Leftmost column was rotated, so face 1 was rotated
-        if column == 0:
-            rotate_face_direction = RotateMove.ANTICLOCKWISE if direction == ColumnMove.UP else RotateMove.CLOCKWISE
-            self._rotate_face(1, rotate_face_direction)
-        # Rightmost column was rotated, so face 3 was rotated
-        elif column == self._size - 1:
-            rotate_face_direction = RotateMove.CLOCKWISE if direction == ColumnMove.UP else RotateMove.ANTICLOCKWISE
-            self._rotate_face(3, rotate_face_direction)
-
-    def _rotate_face(self, face: int, direction: RotateMove) -> None:
-        """
-        Rotates a face of the cube 90 degrees in the given direction.
-
-        This method only writes the given face, it does not affect other adjacent faces.
-        It is intended as a private helper method for the other rotate methods, not as a public method.
+        self.rotate_z_unchecked(column - 1, direction is ColumnMove.UP)
 
-        :param face: The face of the cube, 0-indexed.
-        :param direction: Whether to rotate the face left or right.
-        """
-        # Store each column in the face
-        columns = []
-        for i in range(self._size):
-            columns.append(self.get_column(face, i))
-
-        # Write the stored columns to the rows
-        if direction == RotateMove.ANTICLOCKWISE:
-            for row in range(self._size):
-                # Assign to rows by iterating through columns list in reverse order
-                self._cube[face][row] = columns[self._size - 1 - row]
-        else:  # direction == RotateMove.CLOCKWISE
-            for row in range(self._size):
-                # Assign each row each list in columns in order, but reverse each column list
-                for column in range(self._size):
-                    self._cube[face][row][column] = columns[row][self._size - 1 - column]
+    def rotate_x_unchecked(self, column: int, up: bool) -> None:
+        """
+        The same as rotate_x, but without validating the column, for callers such as solvers that perform
+        many rotations they already know are valid.
+        Warning: An invalid column is not reported, and may rotate the wrong squares or raise an unrelated error.
+
+        :param column: The column to rotate, 0-indexed.
+        :param up: If true, rotates the column up, otherwise rotates it down.
+        """
+        self._apply_move("x", column, up)
+
+    def rotate_y_unchecked(self, row: int, left: bool) -> None:
+        """
+        The same as rotate_y, but without validating the row, for callers such as solvers that perform
+        many rotations they already know are valid.
+        Warning: An invalid row is not reported, and may rotate the wrong squares or raise an unrelated error.
+
+        :param row: The row to rotate, 0-indexed.
+        :param left: If true, rotates the row left, otherwise rotates it right.
+        """
+        self._apply_move("y", row, left)
+
+    def rotate_z_unchecked(self, column: int, up: bool) -> None:
+        """
+        The same as rotate_z, but without validating the column, for callers such as solvers that perform
+        many rotations they already know are valid.
+        Warning: An invalid column is not reported, and may rotate the wrong squares or raise an unrelated error.
+
+        :param column: The column to rotate, 0-indexed.
+        :param up: If true, rotates the column up, otherwise rotates it down.
+        """
+        self._apply_move("z", column, up)
+
+    def apply_moves(self, moves: np.ndarray) -> None:
+        """
+        Performs a batch of rotations encoded by encode_move, in order.
+
+        The whole batch is validated up front, so this avoids the per-call overhead of the rotate methods
+        when performing many moves at once (e.g. for a solver).
+
+        :param moves: A 1-dimensional array of moves encoded by encode_move.
+        :raises ValueError: If the moves aren't a 1-dimensional array of encoded moves,
+            or if any move has an invalid axis or column/row for this cube.
+        """
+        moves = np.asarray(moves)
+        if moves.ndim != 1:
+            raise ValueError("Invalid moves")
+        if moves.size > 0:
+            if not np.issubdtype(moves.dtype, np.integer):
+                raise ValueError("Invalid moves")
+            if moves.min() < 0 or moves.max() > np.iinfo(np.uint16).max:
+                raise ValueError("Invalid moves")
+        moves = moves.astype(np.uint16)
+        if np.any((moves >> 1) & 0b11 >= len(Cube.AXES)):
+            raise ValueError("Invalid axis")
+        if np.any(moves >> 3 >= self._size):
+            raise ValueError("Invalid column/row")
+
+        axes = Cube.AXES
+        for move in moves.tolist():
+            self._apply_move(axes[(move >> 1) & 0b11], move >> 3, bool(move & 1))
+
+    @staticmethod
+    def encode_move(axis: str, index: int, direction: RowMove | ColumnMove) -> int:
+        """
+        Encodes a rotation as a single integer, to be passed (in a uint16 array) to apply_moves.
+
+        The lowest bit is set if the move is UP/LEFT, the next two bits are the axis,
+        and the remaining bits are the 0-indexed column/row.
+
+        :param axis: The axis to rotate around, "x", "y", or "z".
+        :param index: The column/row to rotate, 1-indexed, as it would be passed to the matching rotate method.
+        :param direction: The direction to rotate in, as it would be passed to the matching rotate method.
+        :raises ValueError: If an invalid axis, column/row, or direction is given,
+            or if the column/row is too large to fit in the encoding.
+        """
+        if axis not in Cube.AXES or len(axis) != 1:
+            raise ValueError("Invalid axis")
+        if not 1 <= index <= Cube.MAX_ENCODED_INDEX:
+            raise ValueError("Invalid column/row")
+        if not isinstance(direction, RowMove if axis == "y" else ColumnMove):
+            raise ValueError("Invalid direction")
+        forward = direction is ColumnMove.UP or direction is RowMove.LEFT
+        return ((index - 1) << 3) | (Cube.AXES.index(axis) << 1) | forward
+
+    def get_permutation(self, perform_moves: Callable[[], None]) -> np.ndarray:
+        """
+        Returns the permutation of the squares performed by some rotations of this cube, to be passed to
+        apply_permutation. The cube itself is left unchanged.
+
+        The cube's squares are temporarily replaced by their own indices while <perform_moves> is called,
+        so afterwards each square holds the index of the square that moved into it.
+
+        :param perform_moves: A function that rotates this cube, e.g. one of a simulator's move methods.
+        :return: A flat array of 6*size*size square indices.
+        """
+        saved_buffers = (self._cube, self._scratch, self._flat_cube, self._flat_scratch,
+                         self._faces, self._scratch_faces)
+        self._set_buffers(np.arange(len(self), dtype=np.intp).reshape(self._cube.shape))
+        try:
+            perform_moves()
+            return self._flat_cube
+        finally:
+            (self._cube, self._scratch, self._flat_cube, self._flat_scratch,
+             self._faces, self._scratch_faces) = saved_buffers
+
+    def apply_permutation(self, permutation: np.ndarray) -> None:
+        """
+        Rearranges the squares of the cube by a permutation from get_permutation,
+        so that square i of the flattened cube becomes the square that was at permutation[i].
+
+        :param permutation: A flat array of 6*size*size square indices.
+        :raises ValueError: If the permutation has the wrong shape, or an index that is out of range.
+        """
+        permutation = np.asarray(permutation)
+        if permutation.shape != self._flat_cube.shape or not np.issubdtype(permutation.dtype, np.integer):
+            raise ValueError("Invalid permutation")
+        if permutation.min() < 0 or permutation.max() >= len(self):
+            raise ValueError("Invalid permutation")
+        self._apply_permutation(permutation)
+
+    def _apply_permutation(self, permutation: np.ndarray) -> None:
+        """
+        The same as apply_permutation, but without validating the permutation.
+        An out-of-range index is clipped rather than reported, so only pass permutations known to be valid.
+
+        :param permutation: A flat array of 6*size*size square indices.
+        """
+        np.take(self._flat_cube, permutation, out=self._flat_scratch, mode="clip")
+        self._swap_buffers()
+
+    def _swap_buffers(self) -> None:
+        """ Swaps the cube's buffers (and their flat and face views), once a rotation is written to the scratch. """
+        self._cube, self._scratch = self._scratch, self._cube
+        self._flat_cube, self._flat_scratch = self._flat_scratch, self._flat_cube
+        self._faces, self._scratch_faces = self._scratch_faces, self._faces
+
+    def _apply_move(self, axis: str, index: int, forward: bool) -> None:
+        """
+        Performs a rotation on the cube, without validating it.
+
+        Small cubes gather every square through the rotation's precomputed permutation in one call,
+        which is cheaper than the several slice copies the kernel does.
+        Larger cubes rotate in place with the kernel, since it only copies the squares that move
+        rather than the whole cube.
+
+        :param axis: The axis to rotate around, "x", "y", or "z".
+        :param index: The column/row to rotate, 0-indexed.
+        :param forward: True if the column/row is rotated up/left, False if it is rotated down/right.
+        """
+        move_permutations = self._move_permutations
+        if move_permutations is None:
+            cube_kernels.AXIS_KERNELS[axis](self._cube, index, forward)
+            return
+        self._apply_permutation(move_permutations[axis, index, forward])
 
     def __str__(self) -> str:
         """ Pretty-print self._cube """
-        output = ""
-        for face in range(Cube.FACES_IN_A_CUBE):
-            output += f"Face {face + 1}:"
-            for row in range(self._size):
-                row_string = "\n\t"
-                for column in range(self._size):
-                    row_string += f"[{self.get_square(face, row, column).name}] "
-                row_string = row_string[:-1]  # Exclude final space
-                output += row_string
-            output += "\n"
-        return output[:-1]  # Exclude final newline character
+        face_strings = []
+        for face, face_rows in enumerate(self._cube.tolist()):
+            lines = [f"Face {face + 1}:"]
+            for row in face_rows:
+                lines.append("\t" + " ".join(map(_SQUARE_NAMES.__getitem__, row)))
+            face_strings.append("\n".join(lines))
+        return "\n".join(face_strings)
 
     @staticmethod
-    def create_solved_cube(size: int) -> list[list[list[Colour]]]:
+    def create_solved_cube(size: int) -> np.ndarray:
         """
         Returns a solved cube.
 
@@ -328,10 +420,31 @@ class Cube(ABC):
         """
         if size <= 0:
             raise ValueError("Invalid size")
-        return [[[colour] * size for _ in range(size)] for colour in Colour]
+        colour_values = np.array([colour.value for colour in Colour], dtype=np.uint8)
+        return np.repeat(colour_values, size * size).reshape(Cube.FACES_IN_A_CUBE, size, size)
+
+    @staticmethod
+    def create_cube_from_list(cube_list: list[list[list[Colour]]]) -> np.ndarray:
+        """
+        Returns a cube created from a 3-dimensional list of Colours.
+
+        Warning: This method doesn't check that the cube created is solvable.
+
+        :param cube_list: A list of faces, each of which is a list of rows of Colours.
+            As Colour is an IntEnum, the int values of Colours are accepted too.
+        :return: A (6, size, size) array of Colour values representing a cube.
+        :raises ValueError: If a square isn't a Colour or a Colour value.
+        """
+        try:
+            cube = np.array(cube_list, dtype=np.uint8)  # Colours are ints, so NumPy can convert the lists directly
+        except (TypeError, OverflowError):
+            raise ValueError("Invalid Colour") from None
+        if cube.size > 0 and cube.max() >= len(Colour):
+            raise ValueError("Invalid Colour")
+        return cube
 
     @staticmethod
-    def create_cube_from_string_representation(size: int, string_representation: str) -> list[list[list[Colour]]]:
+    def create_cube_from_string_representation(size: int, string_representation: str) -> np.ndarray:
         """
         Returns a cube created from a string representing how the colours should be assigned to each square.
 
@@ -341,24 +454,20 @@ class Cube(ABC):
             Must be >= 1.
         :param string_representation: A string representing the colours in the cube.
             e.g. "GGGGGGGGGRRRRRRRRRBBBBBBBBBOOOOOOOOOWWWWWWYYYYYY" is a solved cube.
-        :return: A 3-dimensional list of colours representing a cube.
-        :raises ValueError: If a non-positive size is given.
+        :return: A (6, size, size) array of Colour values representing a cube.
+        :raises ValueError: If a non-positive size is given, or if the string contains an invalid character.
         """
         if size <= 0:
             raise ValueError("Invalid size")
 
-        cube_list = []
-        i = 0
-        for face in range(Cube.FACES_IN_A_CUBE):
-            face_list = []
-            for row in range(size):
-                row_list = []
-                for square in range(size):
-                    row_list.append(Cube.get_colour_from_string(string_representation[i]))
-                    i += 1
-                face_list.append(row_list)
-            cube_list.append(face_list)
-        return cube_list
+        square_count = Cube.FACES_IN_A_CUBE * size * size
+        try:
+            colour_values = string_representation[:square_count].encode("ascii").translate(_CHAR_TO_VALUE_TABLE)
+        except UnicodeEncodeError:
+            raise ValueError("Invalid string")
+        if len(colour_values) < square_count or _INVALID_VALUE in colour_values:
+            raise ValueError("Invalid string")
+        return np.frombuffer(colour_values, dtype=np.uint8).reshape(Cube.FACES_IN_A_CUBE, size, size).copy()
 
     @staticmethod
     def get_colour_from_string(colour_string: str) -> Colour:
@@ -367,92 +476,88 @@ class Cube(ABC):
 
         :raises ValueError: If an invalid string is given.
         """
-        match colour_string:
-            case "G":
-                colour = Colour.GREEN
-            case "R":
-                colour = Colour.RED
-            case "B":
-                colour = Colour.BLUE
-            case "O":
-                colour = Colour.ORANGE
-            case "W":
-                colour = Colour.WHITE
-            case "Y":
-                colour = Colour.YELLOW
-            case _:
-                raise ValueError("Invalid string")
-        return colour
+        try:
+            return _CHAR_TO_COLOUR[colour_string]
+        except KeyError:
+            raise ValueError("Invalid string") from None
 
     @staticmethod
     def get_string_from_colour(colour: Colour) -> str:
         """
         Returns a single-character string representing the colour given.
 
-        :raises ValueError: If an invalid Colour is given.
-        """
-        match colour:
-            case Colour.GREEN:
-                colour_string = "G"
-            case Colour.RED:
-                colour_string = "R"
-            case Colour.BLUE:
-                colour_string = "B"
-            case Colour.ORANGE:
-                colour_string = "O"
-            case Colour.WHITE:
-                colour_string = "W"
-            case Colour.YELLOW:
-                colour_string = "Y"
-            case _:
-                raise ValueError("Invalid Colour")
-        return colour_string
+        :raises ValueError: If anything other than a Colour is given.
+        """
+        # Colour is an IntEnum, so plain ints would otherwise be looked up as if they were Colours
+        if not isinstance(colour, Colour):
+            raise ValueError("Invalid Colour")
+        return _COLOUR_TO_CHAR[colour]
 
     @abstractmethod
     def display_cube(self) -> None:
         raise NotImplementedError
 
 
-class CubeIterator:
-    """ Iterates through every square in the cube in order. """
-    def __init__(self, cube: Cube) -> None:
-        self._cube: Cube = cube
-        self._current_face: int = 0
-        self._current_row: int = 0
-        self._current_square: int = 0
-
-    def __iter__(self):
-        return self
-
-    def __next__(self) -> Colour:
-        if self._current_face >= self._cube.FACES_IN_A_CUBE:
-            raise StopIteration
-
-        cube_list = self._cube.get_cube()
-        square: Colour = cube_list[self._current_face][self._current_row][self._current_square]
-
-        self._current_square += 1
-        if self._current_square >= self._cube.get_size():
-            self._current_square = 0
-            self._current_row += 1
-            if self._current_row >= self._cube.get_size():
-                self._current_row = 0
-                self._current_face += 1
-
-        return square
-
-
-class Colour(Enum):
+class Colour(IntEnum):
     """
     Colours for the faces of the cube.
     Note: The ordering here determines the order that colours are assigned to faces.
+
+    The values are the ones stored in a cube's array. They count up from 0 so that they can index lookup tables,
+    and as an IntEnum a Colour can be stored or compared as a plain int without going through .value.
+    """
+    GREEN = 0
+    RED = 1
+    BLUE = 2
+    ORANGE = 3
+    WHITE = 4
+    YELLOW = 5
+
+
+# Maps the values stored in a cube's array back to Colours, so that the array doesn't need to be read through Colour()
+_COLOURS_BY_VALUE: tuple[Colour, ...] = tuple(Colour)
+# How each square is shown by Cube.__str__, indexed by Colour value
+_SQUARE_NAMES: tuple[str, ...] = tuple(f"[{colour.name}]" for colour in Colour)
+
+# The single-character string representing each Colour, and the reverse
+_CHAR_TO_COLOUR: dict[str, Colour] = {
+    "G": Colour.GREEN,
+    "R": Colour.RED,
+    "B": Colour.BLUE,
+    "O": Colour.ORANGE,
+    "W": Colour.WHITE,
+    "Y": Colour.YELLOW
+}
+_COLOUR_TO_CHAR: dict[Colour, str] = {colour: char for char, colour in _CHAR_TO_COLOUR.items()}
+
+# bytes.translate tables for converting between string representations and a cube's array of Colour values,
+# so whole cubes can be converted in a single C-level pass
+_INVALID_VALUE = 255  # Any character that isn't a colour gets translated to this
+
+
+def _create_translation_tables() -> tuple[bytes, bytes]:
+    """ Returns the (Colour value -> character, character -> Colour value) tables for bytes.translate. """
+    value_to_char_table = bytearray(256)
+    char_to_value_table = bytearray([_INVALID_VALUE]) * 256
+    for colour, colour_string in _COLOUR_TO_CHAR.items():
+        char = ord(colour_string)
+        value_to_char_table[colour.value] = char
+        char_to_value_table[char] = colour.value
+    return bytes(value_to_char_table), bytes(char_to_value_table)
+
+
+_VALUE_TO_CHAR_TABLE, _CHAR_TO_VALUE_TABLE = _create_translation_tables()
+
+
+@lru_cache(maxsize=None)
+def _get_solved_cube(size: int) -> np.ndarray:
+    """
+    Returns a solved cube of the given size, shared between every cube of that size so that resetting is one copy.
+    The array is read-only, so copy it rather than modifying it.
     """
-    GREEN = auto()
-    RED = auto()
-    BLUE = auto()
-    ORANGE = auto()
-    WHITE = auto()
-    YELLOW = auto()
+    solved_cube = Cube.create_solved_cube(size)
+    solved_cube.flags.writeable = False
+    return solved_cube
 
 
 class RowMove(Enum):
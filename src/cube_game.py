@@ -1,18 +1,29 @@
 """ Classes in this file provide the game interface to the user. """
 
-from typing import Type
+from typing import Callable, Type
 from abc import ABC, abstractmethod
+import contextlib
+import io
 import os
+import re
+import shutil
+import sys
 
 from .cube_simulator import CubeSimulator
 from .cube import Cube
+from .terminal import synchronise
 
 __author__ = "Lachlan Tait"
 
+# ANSI escape sequences, which take up no width when printed (e.g. the colours of the cube's squares)
+_ANSI_ESCAPE_PATTERN = re.compile(r"\x1b\[[0-9;?]*[A-Za-z]")
+
 
 class CubeGame(ABC):
     """ Abstract interface for a Rubik's Cube simulator game. """
 
+    __slots__ = ("_simulator",)
+
     def __init__(self, simulator_subclass: Type[CubeSimulator], cube_subclass: Type[Cube]) -> None:
         self._simulator: CubeSimulator = simulator_subclass(cube_subclass)
 
@@ -24,8 +35,12 @@ class CubeGame(ABC):
 class CubeGame2D(CubeGame):
     """ Rubik's Cube simulator game with a text-based, console user-interface. """
 
+    __slots__ = ("_message", "_is_case_toggled", "_has_quit", "_previous_frame", "_title_lines", "_moves_lines",
+                 "_static_option_lines", "_cube_lines", "_options_lines", "_history_message", "_actions")
+
     UI_WIDTH = 60
     HORIZONTAL_BORDER = "=" * UI_WIDTH
+    OPTION_WIDTH = (UI_WIDTH // 2) - 3  # The width of each option, two of which fit on a line
 
     QUIT_KEY = "Q"
     RESET_KEY = "W"
@@ -35,6 +50,10 @@ class CubeGame2D(CubeGame):
     SHOW_INVERSE_KEY = "G"
     TOGGLE_CASE_KEY = "T"
 
+    CLEAR_SCREEN = "\x1b[2J\x1b[H"  # ANSI escape sequences: erase the display, then move the cursor home
+    INPUT_PROMPT = "\n> "
+    INPUT_LINES = 3  # The lines below each frame used by the input prompt
+
     MOVES_INSTRUCTION = "Type in a sequence of moves and press ENTER"
 
     def __init__(self, simulator_subclass: Type[CubeSimulator], cube_subclass: Type[Cube]) -> None:
@@ -46,74 +65,145 @@ class CubeGame2D(CubeGame):
         self._message: str = ""
         self._is_case_toggled: bool = False
         self._has_quit: bool = False
+        # The (screen row, line) of each line last drawn on the screen, if they can be redrawn over
+        self._previous_frame: list[tuple[int, str]] | None = None
+
+        # The lines of each region of the screen, kept between frames.
+        # The title and moves never change, and the cube and options are set to None when they need re-rendering.
+        self._title_lines: list[str] = self._render_title()
+        self._moves_lines: list[str] = self._render_moves()
+        self._static_option_lines: list[str] = self._render_static_options()
+        self._cube_lines: list[str] | None = None
+        self._options_lines: list[str] | None = None
+        self._history_message: str | None = None  # Set to None whenever the moves history changes
+
+        # The action to take for each option key
+        self._actions: dict[str, Callable[[], None]] = {
+            CubeGame2D.QUIT_KEY: self._quit,
+            CubeGame2D.RESET_KEY: self._reset,
+            CubeGame2D.SCRAMBLE_KEY: self._scramble,
+            CubeGame2D.UNDO_KEY: self._undo_sequence,
+            CubeGame2D.HISTORY_KEY: self._display_history,
+            CubeGame2D.TOGGLE_CASE_KEY: self._toggle_case,
+            CubeGame2D.SHOW_INVERSE_KEY: self._show_inverse_sequence,
+        }
 
     def play_game(self) -> None:
+        if os.name == "nt":
+            os.system("")  # Makes the Windows console process ANSI escape sequences
         while not self._has_quit:
-            self._clear_screen()
-            self._display_title()
-            self._simulator.display_cube()
-            print(CubeGame2D.HORIZONTAL_BORDER)
-            self._display_options()
-            print(CubeGame2D.HORIZONTAL_BORDER)
-            self._display_moves()
-            print(CubeGame2D.HORIZONTAL_BORDER)
-            self._display_message()
+            self._draw_frame(self._render_frame())
             self._take_action()
 
-    def _take_action(self) -> None:
-        """ Get user input and take the appropriate action. """
-        user_input = input("\n> ")
-        user_input_upper = user_input.upper()
-
-        if user_input_upper == CubeGame2D.QUIT_KEY:
-            self._has_quit = True
-            print()
-
-        elif user_input_upper == CubeGame2D.RESET_KEY:
-            self._simulator.reset_cube()
-            self._message = "Cube reset"
-
-        elif user_input_upper == CubeGame2D.SCRAMBLE_KEY:
-            self._scramble()
+    def _render_frame(self) -> list[str]:
+        """ Returns the lines of the screen to display before the next action is taken. """
+        if self._cube_lines is None:
+            self._cube_lines = self._render_cube()
+        if self._options_lines is None:
+            self._options_lines = self._render_options()
+
+        frame = self._title_lines + self._cube_lines
+        frame.append(CubeGame2D.HORIZONTAL_BORDER)
+        frame.extend(self._options_lines)
+        frame.append(CubeGame2D.HORIZONTAL_BORDER)
+        frame.extend(self._moves_lines)
+        frame.append(CubeGame2D.HORIZONTAL_BORDER)
+        frame.extend(self._render_message())
+        return frame
+
+    def _draw_frame(self, frame: list[str]) -> None:
+        """
+        Draws the frame given over the previously drawn one, only rewriting the lines that changed or moved,
+        then erases everything below it (such as the previous input).
+        """
+        previous_frame = self._previous_frame
+        output: list[str] = []
+        if previous_frame is None:
+            output.append(CubeGame2D.CLEAR_SCREEN)
+            previous_frame = []
+        terminal_size = shutil.get_terminal_size()
+        # Lines wider than the terminal wrap onto the rows below them, so the row each line starts on is counted
+        drawn_frame: list[tuple[int, str]] = []
+        row = 1
+        for i, line in enumerate(frame):
+            line_rows, last_row_width = divmod(self._get_line_width(line), terminal_size.columns)
+            drawn_line = (row, line)
+            if i >= len(previous_frame) or drawn_line != previous_frame[i]:
+                output.append(f"\x1b[{row};1H\x1b[2K{line}")  # Move to the start of the line, erase it, rewrite it
+                if line_rows > 0 and last_row_width > 0:
+                    output.append("\x1b[K")  # Erase the rest of the line's last row, as only its first was erased
+            drawn_frame.append(drawn_line)
+            row += max(line_rows + (last_row_width > 0), 1)
+        output.append(f"\x1b[{row};1H\x1b[J")  # Move below the frame and erase the rest of the screen
+        sys.stdout.write(synchronise("".join(output)))
+        sys.stdout.flush()
+
+        # If the frame and the input prompt don't fit on the screen, the terminal scrolls
+        # and the lines drawn are no longer where they were, so the next frame has to be drawn from scratch
+        if row - 1 + CubeGame2D.INPUT_LINES > terminal_size.lines:
+            self._previous_frame = None
+        else:
+            self._previous_frame = drawn_frame
 
-        elif user_input_upper == CubeGame2D.UNDO_KEY:
-            self._undo_sequence()
+    @staticmethod
+    def _get_line_width(line: str) -> int:
+        """ Returns the amount of columns the line takes up on the screen, not counting ANSI escape sequences. """
+        if "\x1b" in line:
+            line = _ANSI_ESCAPE_PATTERN.sub("", line)
+        return len(line)
 
-        elif user_input_upper == CubeGame2D.HISTORY_KEY:
-            self._display_history()
+    def _take_action(self) -> None:
+        """ Get user input and take the appropriate action. """
+        user_input = input(CubeGame2D.INPUT_PROMPT)
+        if len(CubeGame2D.INPUT_PROMPT.lstrip("\n")) + len(user_input) >= shutil.get_terminal_size().columns:
+            # The input wrapped onto more rows than INPUT_LINES allows for, which may have scrolled the terminal
+            self._previous_frame = None
+        action = self._actions.get(user_input.upper())
+        if action is not None:
+            action()
+        else:
+            self._perform_moves(user_input)
 
-        elif user_input_upper == CubeGame2D.TOGGLE_CASE_KEY:
-            self._is_case_toggled = not self._is_case_toggled
+    def _quit(self) -> None:
+        self._has_quit = True
+        print()
 
-        elif user_input_upper == CubeGame2D.SHOW_INVERSE_KEY:
-            self._show_inverse_sequence()
+    def _reset(self) -> None:
+        self._simulator.reset_cube()
+        self._cube_lines = None
+        self._history_message = None
+        self._message = "Cube reset"
 
-        else:
-            self._perform_moves(user_input)
+    def _toggle_case(self) -> None:
+        self._is_case_toggled = not self._is_case_toggled
+        self._options_lines = None
 
     def _undo_sequence(self) -> None:
-        previous_moves_sequence = self._simulator.get_previous_moves_sequence()
+        previous_moves_sequence = self._simulator.get_previous_moves_string()
         if previous_moves_sequence is not None:
-            previous_moves_sequence = "".join(previous_moves_sequence)
             inverse_sequence = self._simulator.undo_moves_sequence()
+            self._cube_lines = None
+            self._history_message = None
             self._message = f"Previous moves sequence {previous_moves_sequence} reverted using {inverse_sequence}"
         else:
             self._message = "No move sequence to undo"
 
     def _display_history(self) -> None:
-        moves_history = self._simulator.get_moves_history()
-        self._message = "Moves history:"
-        if len(moves_history) > 0:
-            for moves_sequence in moves_history:
-                self._message += "\n- " + "".join(moves_sequence)
-        else:
-            self._message += "\n-"
+        if self._history_message is None:
+            moves_history = self._simulator.get_moves_history_strings()
+            lines = ["Moves history:"]
+            if len(moves_history) > 0:
+                lines.extend(["- " + moves_sequence for moves_sequence in moves_history])
+            else:
+                lines.append("-")
+            self._history_message = "\n".join(lines)
+        self._message = self._history_message
 
     def _show_inverse_sequence(self) -> None:
         """ Displays the inverse of the most recent sequence. """
         previous_sequence = self._simulator.get_previous_moves_sequence()
         if previous_sequence is not None:
-            previous_sequence_string = "".join(previous_sequence)
+            previous_sequence_string = self._simulator.get_previous_moves_string()
             inverse_sequence = self._simulator.get_inverse_sequence(previous_sequence)
             self._message = f"Inverse of {previous_sequence_string}: {inverse_sequence}"
         else:
@@ -126,49 +216,58 @@ class CubeGame2D(CubeGame):
         try:
             self._simulator.perform_moves(moves_string)
         except ValueError as e:
-            self._message = e  # An error message will be printed next time the screen is displayed
+            self._message = str(e)  # The error message will be shown next time the screen is displayed
+        self._cube_lines = None  # Moves before an invalid one are still performed
+        self._history_message = None
 
     def _scramble(self) -> None:
         self._simulator.scramble()
+        self._cube_lines = None
         self._message = "Cube scrambled"
 
-    def _display_title(self) -> None:
+    def _render_cube(self) -> list[str]:
+        """ Returns the lines printed by the cube's display_cube method. """
+        cube_display = io.StringIO()
+        with contextlib.redirect_stdout(cube_display):
+            self._simulator.display_cube()
+        return cube_display.getvalue().splitlines()
+
+    def _render_title(self) -> list[str]:
         size = self._simulator.get_size()
-        print(CubeGame2D.HORIZONTAL_BORDER)
-        print(f"Rubik's Cube Simulator {size}x{size}")
-        print(CubeGame2D.HORIZONTAL_BORDER)
+        return [CubeGame2D.HORIZONTAL_BORDER, f"Rubik's Cube Simulator {size}x{size}", CubeGame2D.HORIZONTAL_BORDER]
 
-    def _display_options(self) -> None:
-        print("OPTIONS:")
+    def _render_options(self) -> list[str]:
         toggle_case_state = "X" if self._is_case_toggled else " "
-        option_width = (self.UI_WIDTH // 2) - 3
-        print("| " + f"[{self.QUIT_KEY}]: Quit".ljust(option_width)
-              + "| " + f"[{self.RESET_KEY}]: Reset cube".ljust(option_width) + " |")
-        print("| " + f"[{self.SCRAMBLE_KEY}]: Scramble cube".ljust(option_width)
-              + "| " + f"[{self.UNDO_KEY}]: Undo last sequence".ljust(option_width) + " |")
-        print("| " + f"[{self.HISTORY_KEY}]: Show moves history".ljust(option_width)
-              + "| " + f"[{self.SHOW_INVERSE_KEY}]: Show inverse sequence".ljust(option_width) + " |")
-        print("| " + f"[{self.TOGGLE_CASE_KEY}]: Toggle case [{toggle_case_state}]".ljust(option_width) + "|")
-
-    def _display_moves(self) -> None:
-        print("MOVES:")
-        for modifier in [" ", "'", "2"]:
-            output = ""
-            for move in self._simulator.get_moves():
-                output += move + modifier + " "
-            print(output)
-
-    def _display_message(self) -> None:
-        """ Displays the message that is currently set, then clears it. """
+        option_width = CubeGame2D.OPTION_WIDTH
+        return self._static_option_lines + [
+            "| " + f"[{self.TOGGLE_CASE_KEY}]: Toggle case [{toggle_case_state}]".ljust(option_width) + "|"
+        ]
+
+    def _render_static_options(self) -> list[str]:
+        """ Returns the lines of the options that never change, i.e. all of them except toggle case. """
+        option_width = CubeGame2D.OPTION_WIDTH
+        return [
+            "OPTIONS:",
+            "| " + f"[{self.QUIT_KEY}]: Quit".ljust(option_width)
+            + "| " + f"[{self.RESET_KEY}]: Reset cube".ljust(option_width) + " |",
+            "| " + f"[{self.SCRAMBLE_KEY}]: Scramble cube".ljust(option_width)
+            + "| " + f"[{self.UNDO_KEY}]: Undo last sequence".ljust(option_width) + " |",
+            "| " + f"[{self.HISTORY_KEY}]: Show moves history".ljust(option_width)
+            + "| " + f"[{self.SHOW_INVERSE_KEY}]: Show inverse sequence".ljust(option_width) + " |"
+        ]
+
+    def _render_moves(self) -> list[str]:
+        moves = self._simulator.get_moves()
+        return ["MOVES:"] + ["".join([move + modifier + " " for move in moves]) for modifier in [" ", "'", "2"]]
+
+    def _render_message(self) -> list[str]:
+        """ Returns the lines of the message that is currently set, then clears it. """
         if self._message == "":
-            most_recent_moves_sequence = self._simulator.get_previous_moves_sequence()
+            most_recent_moves_sequence = self._simulator.get_previous_moves_string()
             if most_recent_moves_sequence is not None:
-                self._message = "Last move: " + "".join(most_recent_moves_sequence)
+                self._message = "Last move: " + most_recent_moves_sequence
             else:
                 self._message = CubeGame2D.MOVES_INSTRUCTION
-        print(self._message)
+        lines = self._message.splitlines()
         self._message = ""
-
-    @staticmethod
-    def _clear_screen() -> None:
-        os.system("cls" if os.name == "nt" else "clear")
+        return lines
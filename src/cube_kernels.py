@@ -0,0 +1,167 @@
+"""
+Functions that perform rotations directly on the raw arrays of a Cube.
+
+Each function takes the (6, size, size) uint8 array of Colour values along with plain 0-indexed ints and bool flags
+(rather than Cube objects and move enums), so the Cube class only has to validate its arguments and dispatch here.
+Each function rotates the cube in place, copying aside only the columns/rows that move before overwriting them,
+so a rotation costs O(size) (plus O(size*size) when it turns a face) however large the cube is.
+See Cube for how the faces and axes are laid out.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+
+__author__ = "Lachlan Tait"
+
+# For rotate_y, the faces (out of 0-3) that each of faces 0-3 take their row from
+_ROW_ORDER_LEFT = [1, 2, 3, 0]
+_ROW_ORDER_RIGHT = [3, 0, 1, 2]
+
+
+def rotate_x(cube: np.ndarray, column: int, up: bool) -> None:
+    """
+    Rotates the column specified 90 degrees around the x-axis.
+
+    :param cube: The (6, size, size) array of Colour values to rotate.
+    :param column: The column to rotate, 0-indexed.
+    :param up: If true, rotates the column up, otherwise rotates it down.
+    """
+    size = cube.shape[1]
+    opposite = size - 1 - column  # The opposite column on face 3
+
+    # Rotate the column
+    column_1 = cube[1, :, column].copy()
+    column_3 = cube[3, :, opposite].copy()
+    column_4 = cube[4, :, column].copy()
+    column_5 = cube[5, :, column].copy()
+    if up:
+        cube[1, :, column] = column_5
+        cube[4, :, column] = column_1
+        cube[3, :, opposite] = column_4[::-1]
+        cube[5, :, column] = column_3[::-1]
+    else:
+        cube[1, :, column] = column_4
+        cube[4, :, column] = column_3[::-1]
+        cube[3, :, opposite] = column_5[::-1]
+        cube[5, :, column] = column_1
+
+    # Leftmost or rightmost column was rotated, so face 0 or 2 was rotated
+    face_turn = _get_edge_face_turns(size).get(("x", column, up))
+    if face_turn is not None:
+        rotate_face(cube, *face_turn)
+
+
+def rotate_y(cube: np.ndarray, row: int, left: bool) -> None:
+    """
+    Rotates the row specified 90 degrees around the y-axis.
+
+    :param cube: The (6, size, size) array of Colour values to rotate.
+    :param row: The row to rotate, 0-indexed.
+    :param left: If true, rotates the row left, otherwise rotates it right.
+    """
+    # Rotate the row on faces 0-3 in one go (indexing with a list copies the rows before they are overwritten)
+    cube[:4, row] = cube[_ROW_ORDER_LEFT if left else _ROW_ORDER_RIGHT, row]
+
+    # Top or bottom row was rotated, so face 4 or 5 was rotated
+    face_turn = _get_edge_face_turns(cube.shape[1]).get(("y", row, left))
+    if face_turn is not None:
+        rotate_face(cube, *face_turn)
+
+
+def rotate_z(cube: np.ndarray, column: int, up: bool) -> None:
+    """
+    Rotates the column specified 90 degrees around the z-axis.
+
+    :param cube: The (6, size, size) array of Colour values to rotate.
+    :param column: The column to rotate, 0-indexed.
+    :param up: If true, rotates the column up, otherwise rotates it down.
+    """
+    size = cube.shape[1]
+    opposite = size - 1 - column  # The opposite column on faces 4 and 0
+
+    # Rotate the column
+    # Some 'columns' here are actually stored as rows
+    column_0 = cube[0, :, opposite].copy()
+    column_2 = cube[2, :, column].copy()
+    row_4 = cube[4, opposite].copy()
+    row_5 = cube[5, column].copy()
+    if up:
+        cube[2, :, column] = row_5[::-1]
+        cube[4, opposite] = column_2
+        cube[0, :, opposite] = row_4[::-1]
+        cube[5, column] = column_0
+    else:
+        cube[2, :, column] = row_4
+        cube[4, opposite] = column_0[::-1]
+        cube[0, :, opposite] = row_5
+        cube[5, column] = column_2[::-1]
+
+    # Leftmost or rightmost column was rotated, so face 1 or 3 was rotated
+    face_turn = _get_edge_face_turns(size).get(("z", column, up))
+    if face_turn is not None:
+        rotate_face(cube, *face_turn)
+
+
+def rotate_face(cube: np.ndarray, face: int, clockwise: bool) -> None:
+    """
+    Rotates a face of the cube 90 degrees, without affecting any adjacent faces.
+
+    :param cube: The (6, size, size) array of Colour values to rotate.
+    :param face: The face of the cube, 0-indexed.
+    :param clockwise: If true, rotates the face clockwise, otherwise rotates it anticlockwise.
+    """
+    # np.rot90 rotates anticlockwise for positive k. It returns a view of the same face,
+    # so it is copied before being written back over the face.
+    cube[face] = np.rot90(cube[face], -1 if clockwise else 1).copy()
+
+
+# The rotate function for each axis
+AXIS_KERNELS = {"x": rotate_x, "y": rotate_y, "z": rotate_z}
+
+
+@lru_cache(maxsize=None)
+def get_move_permutations(size: int) -> dict[tuple[str, int, bool], np.ndarray]:
+    """
+    Returns the permutation of the squares performed by every rotation of a cube of the given size.
+
+    Each permutation is found by performing the rotation once on a cube whose squares are numbered 0 to 6*size*size-1.
+    Applying the rotation to a flattened cube array is then a single gather: new_squares = squares[permutation].
+
+    :param size: The size of the cube.
+    :return: A dict mapping (axis, 0-indexed column/row, direction flag) to a flat array of square indices,
+        where the axis and direction flag are as used by the rotate functions above.
+    """
+    identity = np.arange(6 * size * size, dtype=np.intp).reshape(6, size, size)
+    permutations = {}
+    for axis, kernel in AXIS_KERNELS.items():
+        for index in range(size):
+            for forward in (True, False):
+                rotated = identity.copy()
+                kernel(rotated, index, forward)
+                permutations[axis, index, forward] = rotated.reshape(-1)
+    return permutations
+
+
+@lru_cache(maxsize=None)
+def _get_edge_face_turns(size: int) -> dict[tuple[str, int, bool], tuple[int, bool]]:
+    """
+    Returns which face is rotated when an outermost column/row of a cube of the given size is rotated.
+
+    This resolves the checks for whether the first or last column/row was rotated once per size,
+    instead of once per rotation.
+
+    :param size: The size of the cube.
+    :return: A dict mapping (axis, 0-indexed column/row, whether it was rotated up/left)
+        to (face, whether the face turns clockwise). Columns/rows that don't rotate a face are not included.
+    """
+    face_turns = {}
+    for forward in (True, False):
+        # Last columns/rows first, so that the first column/row takes priority on a 1x1 cube
+        face_turns["x", size - 1, forward] = (2, forward)
+        face_turns["y", size - 1, forward] = (5, not forward)
+        face_turns["z", size - 1, forward] = (3, forward)
+        face_turns["x", 0, forward] = (0, not forward)
+        face_turns["y", 0, forward] = (4, forward)
+        face_turns["z", 0, forward] = (1, not forward)
+    return face_turns
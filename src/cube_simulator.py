@@ -1,10 +1,25 @@
 from typing import Type, Callable
 import random
+import re
+import sys
+
+import numpy as np
 
 from .cube import Cube
 
 __author__ = "Lachlan Tait"
 
+# str.translate table that deletes whitespace, so it can be stripped from a moves string in a single C-level pass
+_WHITESPACE_TABLE = str.maketrans("", "", " \t\n\r")
+
+# Characters that modify the move before them: ' for prime, and 2 for performing the move twice
+_MODIFIERS = "'2"
+# Splits a moves string into (move, modifier) pairs, where the modifier may be empty.
+# Any character can be matched as a move, so that invalid characters are reported rather than skipped.
+_MOVE_PATTERN = re.compile(r"(.)([" + _MODIFIERS + r"]?)", re.DOTALL)
+# The modifier that undoes each modifier
+_INVERSE_MODIFIERS = {"": "'", "'": "", "2": "2"}
+
 
 class CubeSimulator:
     """
@@ -16,9 +31,17 @@ class CubeSimulator:
     string representing the move, and a function that performs that move. e.g. "U": self.move_U
     All such functions should have a keyword argument named "prime" to perform the 'prime' version of that move.
 
+    perform_moves doesn't call these functions itself. Instead, each one is called once (with prime as needed) by
+    Cube.get_permutation, while the cube's squares are temporarily replaced by their indices, and the permutation
+    recorded is what every later perform_moves applies. So move functions must only rotate self._cube, always in
+    the same way, with no other side effects.
+
     This class itself cannot be instantiated, only its subclasses. This is enforced manually in __init__.
     """
 
+    __slots__ = ("_cube", "_size", "_moves", "_move_names", "_move_permutations", "_moves_history", "_sequence_ends",
+                 "_sequence_strings", "_SCRAMBLE_MOVE_COUNT")
+
     def __init__(self, cube_subclass: Type[Cube], size: int = 0, scramble_move_count: int = 10) -> None:
         """
         Initialises the simulator.
@@ -33,7 +56,12 @@ class CubeSimulator:
         self._cube: Cube = cube_subclass(size)
         self._size: int = size
         self._moves: dict[str, Callable] = {}
-        self._moves_history: list[list[str]] = []
+        self._move_names: tuple[str, ...] | None = None  # The keys of self._moves, see get_moves
+        self._move_permutations: dict[str, np.ndarray] | None = None  # See _get_move_permutations
+        # Every recorded move in order, and the index in self._moves_history just after each recorded sequence
+        self._moves_history: list[str] = []
+        self._sequence_ends: list[int] = []
+        self._sequence_strings: list[str] = []  # Each recorded sequence joined into a string, for displaying
         self._SCRAMBLE_MOVE_COUNT = scramble_move_count
 
     def get_cube(self) -> Cube:
@@ -42,16 +70,32 @@ class CubeSimulator:
     def get_size(self) -> int:
         return self._size
 
-    def get_moves(self) -> list[str]:
-        """ Returns the list of moves that can be performed (without modified versions e.g. U' and U2). """
-        return list(self._moves.keys())
+    def get_moves(self) -> tuple[str, ...]:
+        """ Returns the moves that can be performed (without modified versions e.g. U' and U2). """
+        # Built on first use, as subclasses fill in self._moves after CubeSimulator.__init__
+        if self._move_names is None:
+            self._move_names = tuple(self._moves)
+        return self._move_names
 
     def get_moves_history(self) -> list[list[str]]:
-        return self._moves_history
+        """ Returns every recorded sequence of moves, oldest first. """
+        moves_history = self._moves_history
+        sequence_starts = [0] + self._sequence_ends[:-1]
+        return [moves_history[start:end] for start, end in zip(sequence_starts, self._sequence_ends)]
+
+    def get_moves_history_strings(self) -> list[str]:
+        """ Returns every recorded sequence of moves as a string, oldest first. """
+        return self._sequence_strings.copy()  # A copy, so that the history can't be changed through it
+
+    def get_previous_moves_string(self) -> str | None:
+        """ Returns the most recent sequence of moves as a string, or None if there isn't one. """
+        if len(self._sequence_strings) > 0:
+            return self._sequence_strings[-1]
+        return None
 
     def get_previous_moves_sequence(self) -> list[str] | None:
-        if len(self._moves_history) > 0:
-            return self._moves_history[-1]
+        if len(self._sequence_ends) > 0:
+            return self._moves_history[self._get_previous_sequence_start():]
         return None
 
     def perform_moves(self, moves_string: str, *, record: bool = True) -> None:
@@ -64,49 +108,57 @@ class CubeSimulator:
         :raises ValueError: If a modifier is given with no move before it to perform it on,
             or if an invalid character is given.
         """
-        stored_move = None
-        stored_char: str | None = None
+        move_permutations = self._get_move_permutations()
         moves_list: list[str] = []
-        for char in self._remove_whitespace(moves_string):
-            if char == "2":
-                if stored_move:
-                    self.move_twice(stored_move)
-                    moves_list.append(stored_char + char)
-                    stored_move = None
-                    stored_char = None
+        # The moves are composed into a single permutation, so the cube itself is only rearranged once.
+        # Performing permutation a then b is the same as performing a[b].
+        sequence_permutation: np.ndarray | None = None
+        try:
+            for move_char, modifier in _MOVE_PATTERN.findall(self._remove_whitespace(moves_string)):
+                move = move_char + modifier
+                permutation = move_permutations.get(move)
+                if permutation is None:
+                    if move_char in _MODIFIERS:
+                        raise ValueError(f"Typed {move_char} with nothing/invalid value before it")
+                    raise ValueError(f"Invalid character: \"{move_char}\"")
+                if sequence_permutation is None:
+                    sequence_permutation = permutation
                 else:
-                    raise ValueError("Typed 2 with nothing/invalid value before it")
-            elif char == "'":
-                if stored_move:
-                    stored_move(prime=True)
-                    moves_list.append(stored_char + char)
-                    stored_move = None
-                    stored_char = None
-                else:
-                    raise ValueError("Typed ' with nothing/invalid value before it")
-            else:
-                if stored_move:
-                    stored_move()
-                    moves_list.append(stored_char)
-                try:
-                    stored_move = self._moves[char]
-                    stored_char = char
-                except KeyError:
-                    raise ValueError(f"Invalid character: \"{char}\"")
-        if stored_move:
-            stored_move()
-            moves_list.append(stored_char)
+                    sequence_permutation = sequence_permutation[permutation]
+                moves_list.append(sys.intern(move))
+        finally:
+            # Moves before an invalid character are still performed
+            if sequence_permutation is not None:
+                self._cube.apply_permutation(sequence_permutation)
         if record and len(moves_list) > 0:
-            self._moves_history.append(moves_list)
+            self._moves_history.extend(moves_list)
+            self._sequence_ends.append(len(self._moves_history))
+            self._sequence_strings.append("".join(moves_list))
+
+    def _get_move_permutations(self) -> dict[str, np.ndarray]:
+        """
+        Returns the permutation of the cube's squares performed by each move, including its modified versions,
+        e.g. "U", "U'" and "U2". This way each move is performed as a single permutation of the cube,
+        however many rotations its move function does.
+        """
+        # Built on first use, as subclasses fill in self._moves after CubeSimulator.__init__
+        if self._move_permutations is None:
+            get_permutation = self._cube.get_permutation
+            self._move_permutations = {}
+            for move_char, move in self._moves.items():
+                self._move_permutations[move_char] = get_permutation(move)
+                # Interned, so that the history can share these strings instead of storing a new one per move
+                self._move_permutations[sys.intern(move_char + "'")] = get_permutation(lambda: move(prime=True))
+                self._move_permutations[sys.intern(move_char + "2")] = get_permutation(lambda: self.move_twice(move))
+        return self._move_permutations
+
+    def _get_previous_sequence_start(self) -> int:
+        """ Returns the index in self._moves_history of the first move of the most recent sequence. """
+        return self._sequence_ends[-2] if len(self._sequence_ends) > 1 else 0
 
     @staticmethod
     def _remove_whitespace(input_str: str) -> str:
-        whitespace_chars = [" ", "\t"]
-        output_str = ""
-        for char in input_str:
-            if char not in whitespace_chars:
-                output_str += char
-        return output_str
+        return input_str.translate(_WHITESPACE_TABLE)
 
     @staticmethod
     def move_twice(move: Callable) -> None:
@@ -120,9 +172,13 @@ class CubeSimulator:
         :return: The sequence of moves used to undo the most recent sequence, as a string.
         :raises ValueError: If there is no moves sequence left to undo.
         """
-        if len(self._moves_history) == 0:
+        if len(self._sequence_ends) == 0:
             raise ValueError("No moves sequence to undo.")
-        previous_moves_sequence: list[str] = self._moves_history.pop()
+        previous_sequence_start = self._get_previous_sequence_start()
+        previous_moves_sequence: list[str] = self._moves_history[previous_sequence_start:]
+        del self._moves_history[previous_sequence_start:]
+        self._sequence_ends.pop()
+        self._sequence_strings.pop()
         inverse_sequence = self.get_inverse_sequence(previous_moves_sequence)
         self.perform_moves(inverse_sequence, record=False)
         return inverse_sequence
@@ -135,29 +191,51 @@ class CubeSimulator:
         :param moves_sequence: A list of strings representing individual moves
         :return: A string of moves, in the same format that could be passed to self.perform_moves
         """
-        inverse_sequence = ""
-        for i in range(len(moves_sequence) - 1, -1, -1):
-            move: str = moves_sequence[i]
-            if len(move) == 1:
-                inverse_sequence += move + "'"
-            elif move[1] == "'":
-                inverse_sequence += move[0]
-            elif move[1] == "2":
-                inverse_sequence += move
-        return inverse_sequence
+        return "".join([move[0] + _INVERSE_MODIFIERS[move[1:]] for move in reversed(moves_sequence)])
 
     def scramble(self) -> None:
         """ Scrambles the cube. """
-        scramble_sequence = ""
-        for _ in range(self._SCRAMBLE_MOVE_COUNT):
-            random_move: str = random.choice(self.get_moves())
-            random_move += random.choice(["", "'", "2"])
-            scramble_sequence += random_move
+        # Pick every move and every modifier in one go
+        random_moves = random.choices(self.get_moves(), k=self._SCRAMBLE_MOVE_COUNT)
+        random_modifiers = random.choices(["", "'", "2"], k=self._SCRAMBLE_MOVE_COUNT)
+        scramble_sequence = "".join([move + modifier for move, modifier in zip(random_moves, random_modifiers)])
         self.perform_moves(scramble_sequence, record=False)
 
+    def get_scrambled_cubes(self, count: int) -> list[Cube]:
+        """
+        Returns many independent copies of the cube, each scrambled separately. The simulator's cube is unchanged.
+
+        The scrambles are built for every cube at once: one permutation per cube is kept in a (count, squares) array,
+        and each step of the scrambles composes every cube's next random move into it with a single gather.
+
+        :param count: The amount of scrambled cubes to return.
+        :return: A list of <count> cubes.
+        :raises ValueError: If a negative count is given.
+        """
+        if count < 0:
+            raise ValueError("Invalid count")
+        move_permutations = self._get_move_permutations()
+        # Every move and modified move is equally likely, just like picking a move and a modifier separately
+        permutation_table = np.stack(list(move_permutations.values()))
+        random_moves = np.array(random.choices(range(len(permutation_table)), k=count * self._SCRAMBLE_MOVE_COUNT),
+                                dtype=np.intp).reshape(count, self._SCRAMBLE_MOVE_COUNT)
+        scramble_permutations = np.broadcast_to(np.arange(len(self._cube), dtype=np.intp),
+                                                (count, len(self._cube)))
+        for step_moves in random_moves.T:
+            scramble_permutations = np.take_along_axis(scramble_permutations, permutation_table[step_moves], axis=1)
+
+        scrambled_cubes = []
+        for scramble_permutation in scramble_permutations:
+            scrambled_cube = self._cube.clone()
+            scrambled_cube.apply_permutation(scramble_permutation)
+            scrambled_cubes.append(scrambled_cube)
+        return scrambled_cubes
+
     def display_cube(self) -> None:
         self._cube.display_cube()
 
     def reset_cube(self) -> None:
         self._cube.reset()
         self._moves_history.clear()
+        self._sequence_ends.clear()
+        self._sequence_strings.clear()
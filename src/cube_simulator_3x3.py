@@ -12,6 +12,8 @@ class CubeSimulator3x3(CubeSimulator):
     (sourced here: https://solvethecube.com/notation).
     """
 
+    __slots__ = ()
+
     def __init__(self, cube_subclass: Type[Cube]) -> None:
         """
         Initialises the cube using the Cube subclass given.
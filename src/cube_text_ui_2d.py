@@ -1,18 +1,130 @@
-from termcolor import colored
+from __future__ import annotations
+
+from functools import lru_cache
+import os
+import sys
+
+import numpy as np
 
 from .cube import Cube, Colour
+from .terminal import is_stdout_a_terminal, synchronise
 
 __author__ = "Lachlan Tait"
 
+# The ANSI foreground colour code used to display each Colour
+_COLOUR_TO_ANSI_CODE: dict[Colour, int] = {
+    Colour.RED: 31,
+    Colour.WHITE: 97,
+    Colour.ORANGE: 33,  # No orange in the standard terminal colours :(, so this is yellow
+    Colour.YELLOW: 93,  # Light yellow
+    Colour.GREEN: 32,
+    Colour.BLUE: 34
+}
+
+def _can_use_colour() -> bool:
+    """
+    Returns whether to colour the output, following the same conventions as termcolor:
+    NO_COLOR/ANSI_COLORS_DISABLED turn colour off, FORCE_COLOR turns it on, and otherwise only colour a terminal.
+    """
+    if "ANSI_COLORS_DISABLED" in os.environ or "NO_COLOR" in os.environ:
+        return False
+    if "FORCE_COLOR" in os.environ:
+        return True
+    return is_stdout_a_terminal() and os.environ.get("TERM") != "dumb"
+
+
+def _create_coloured_squares() -> list[str]:
+    """ Returns a list of the coloured square strings, indexed by the Colour value stored in a cube's array. """
+    if not _can_use_colour():
+        return ["■"] * len(Colour)
+    return [f"\x1b[{_COLOUR_TO_ANSI_CODE[colour]}m■\x1b[0m" for colour in Colour]
+
+
+# Only six coloured squares can ever be displayed, so build them once instead of once per square per display
+_COLOURED_SQUARES: list[str] = _create_coloured_squares()
+
+
+@lru_cache(maxsize=16)
+def _build_net_template(size: int) -> tuple[str, np.ndarray]:
+    """
+    Returns a template of the net displayed for a cube of the given size, shared between all displays of that size.
+
+    The template is the whole net with its borders already drawn, and a {} slot for each square. Filling the slots
+    with the coloured squares taken from the flattened cube in net order then needs no Python loops over rows.
+
+    :param size: The size of the cube.
+    :return: The str.format template, and the flat index into the cube's array of the square for each slot.
+    """
+    horizontal_line = "=" * (size * 2 + 1)
+    space_before = " " * (2 + size * 2)
+    row_slots = " ".join(["{}"] * size)
+    net_order: list[int] = []
+
+    def add_face_row(face: int, row: int) -> None:
+        start = (face * size + row) * size
+        net_order.extend(range(start, start + size))
+
+    # Face 4 (top)
+    lines = [space_before + "╔" + horizontal_line + "╗"]
+    for row in range(size):
+        lines.append(space_before + "╟ " + row_slots + " ╢")
+        add_face_row(4, row)
+
+    # Faces 0-3
+    lines.append("╔" + "╬".join([horizontal_line] * 3) + "╦" + horizontal_line + "╗")
+    for row in range(size):
+        lines.append("╟ " + " ╫ ".join([row_slots] * 4) + " ╢")
+        for face in range(4):
+            add_face_row(face, row)
+    lines.append("╚" + "╬".join([horizontal_line] * 3) + "╩" + horizontal_line + "╝")
+
+    # Face 5 (bottom)
+    for row in range(size):
+        lines.append(space_before + "╟ " + row_slots + " ╢")
+        add_face_row(5, row)
+    lines.append(space_before + "╚" + horizontal_line + "╝")
+
+    return "\n".join(lines) + "\n", np.array(net_order, dtype=np.intp)
+
 
 class CubeTextUI2D(Cube):
     """
     This cube subclass provides a text-based, coloured representation of a cube.
     The cube is represented as a 2D net.
     """
+
+    __slots__ = ("_net_template", "_net_order")
+
+    def __init__(self, size: int, *,
+                 cube_list: list[list[list[Colour]]] | None = None,
+                 string_repr: str | None = None
+                 ) -> None:
+        """
+        Initialises the cube, and the strings used to display it.
+
+        See Cube.__init__ for the parameters.
+        """
+        super().__init__(size, cube_list=cube_list, string_repr=string_repr)
+        self._net_template: str
+        self._net_order: np.ndarray
+        self._net_template, self._net_order = _build_net_template(self._size)
+
+    def clone(self) -> CubeTextUI2D:
+        """ Returns an independent copy of the cube, sharing the template used to display it. """
+        clone = super().clone()
+        clone._net_template = self._net_template
+        clone._net_order = self._net_order
+        return clone
+
     def display_cube(self) -> None:
+        """ Display a text interface representing the cube as a 2D net. See render_cube for an example. """
+        # Write the whole net at once rather than a line at a time
+        sys.stdout.write(synchronise(self.render_cube()))
+
+    def render_cube(self) -> str:
         """
-        Display a text interface representing the cube as a 2D net.
+        Returns the text interface representing the cube as a 2D net, as display_cube would display it.
+        Each line, including the last, ends with a newline.
 
         Example:
                 ╔=======╗
@@ -29,68 +141,6 @@ class CubeTextUI2D(Cube):
                 ╟ ■ ■ ■ ╢
                 ╚=======╝
         """
-        horizontal_line = "=" * (self._size * 2 + 1)
-        space_before = " " * (2 + self._size * 2)
-
-        # Face 4 (top)
-        print(space_before + "╔" + horizontal_line + "╗")
-        for row in range(self._size):
-            row_output = space_before + "╟ "
-            for column in range(self._size):
-                row_output += self._get_coloured_square(4, row, column) + " "
-            row_output += "╢"
-            print(row_output)
-
-        # Faces 0-3
-        print("╔" + horizontal_line + "╬" + horizontal_line + "╬" + horizontal_line + "╦" + horizontal_line + "╗")
-        for row in range(self._size):
-            row_output = "╟ "
-            for face in range(4):  # Do faces 0, 1, 2, 3
-                for column in range(self._size):
-                    row_output += self._get_coloured_square(face, row, column) + " "
-                row_output += "╫ "
-            row_output = row_output[:-2] + "╢"
-            print(row_output)
-        print("╚" + horizontal_line + "╬" + horizontal_line + "╬" + horizontal_line + "╩" + horizontal_line + "╝")
-
-        # Face 5 (bottom)
-        for row in range(self._size):
-            row_output = space_before + "╟ "
-            for column in range(self._size):
-                row_output += self._get_coloured_square(5, row, column) + " "
-            row_output += "╢"
-            print(row_output)
-        print(space_before + "╚" + horizontal_line + "╝")
-
-    def _get_coloured_square(self, face: int, row: int, column: int) -> str:
-        """
-        Returns a coloured string, displaying the colour of the given square in the cube.
-
-        :param face: The face of the cube, 0-indexed.
-        :param row: The row within the face, 0-indexed.
-        :param column: The column within the row, 0-indexed.
-        :raises ValueError: If an invalid face, row, or column is given.
-        """
-        if not 0 <= face < Cube.FACES_IN_A_CUBE:
-            raise ValueError("Invalid face")
-        if not 0 <= row < self._size:
-            raise ValueError("Invalid row")
-        if not 0 <= column < self._size:
-            raise ValueError("Invalid column")
-
-        match self.get_square(face, row, column):
-            case Colour.RED:
-                colour = "red"
-            case Colour.WHITE:
-                colour = "white"
-            case Colour.ORANGE:
-                colour = "yellow"  # No orange in termcolor :(
-            case Colour.YELLOW:
-                colour = "light_yellow"
-            case Colour.GREEN:
-                colour = "green"
-            case Colour.BLUE:
-                colour = "blue"
-            case _:
-                colour = "black"
-        return colored("■", colour)
+        coloured_squares = _COLOURED_SQUARES
+        squares_in_net_order = self._cube.take(self._net_order).tolist()
+        return self._net_template.format(*[coloured_squares[value] for value in squares_in_net_order])
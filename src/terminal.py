@@ -0,0 +1,24 @@
+""" Functions for writing to the terminal, shared by the text-based displays and games. """
+
+import sys
+
+__author__ = "Lachlan Tait"
+
+# Terminals that support synchronised output hold off redrawing between these (others ignore them)
+BEGIN_SYNCHRONISED_UPDATE = "\x1b[?2026h"
+END_SYNCHRONISED_UPDATE = "\x1b[?2026l"
+
+
+def is_stdout_a_terminal() -> bool:
+    """ Returns whether stdout is a terminal. Replacements for stdout may not have an isatty method at all. """
+    return hasattr(sys.stdout, "isatty") and sys.stdout.isatty()
+
+
+def synchronise(output: str) -> str:
+    """
+    Returns the output given, wrapped so that a terminal presents it in one go rather than as it arrives.
+    The output is returned unchanged if stdout is not a terminal (e.g. if it is redirected to a file).
+    """
+    if is_stdout_a_terminal():
+        return BEGIN_SYNCHRONISED_UPDATE + output + END_SYNCHRONISED_UPDATE
+    return output
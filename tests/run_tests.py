@@ -10,8 +10,15 @@ Strategy for testing 'patterns':
     the string representation I gave.
 """
 
+from functools import lru_cache
+from unittest import mock
+import contextlib
+import io
+import os
+import random
 import unittest
 
+from src import cube_kernels
 from src.cube import RowMove, ColumnMove, Colour
 from src.cube_text_ui_2d import CubeTextUI2D
 from src.cube_simulator_3x3 import CubeSimulator3x3
@@ -61,6 +68,15 @@ patterns: list[tuple[str, str, str]] = [
      )
 ]
 
+# A solved 3x3 cube to compare against, shared between tests. Must not be modified.
+_SOLVED_3 = CubeTextUI2D(3)
+
+
+@lru_cache(maxsize=None)
+def _expected_cube(string_repr: str) -> CubeTextUI2D:
+    """ Returns the 3x3 cube with the layout given, shared between tests. Must not be modified. """
+    return CubeTextUI2D(3, string_repr=string_repr)
+
 
 class TestCube(unittest.TestCase):
     def test_example(self):
@@ -112,43 +128,157 @@ class TestCube(unittest.TestCase):
         self.assertEqual(test_cube, expected_cube, "Creating a cube from a string representation doesn't work")
 
         test_cube.reset()
+        self.assertEqual(test_cube, _SOLVED_3, "Resetting the cube doesn't work")
+
+        self.assertEqual(CubeTextUI2D.get_string_from_colour(Colour.GREEN), "G", "Converting a Colour doesn't work")
+        self.assertRaises(ValueError, CubeTextUI2D.get_string_from_colour, Colour.GREEN.value)
+        self.assertRaises(ValueError, CubeTextUI2D.create_cube_from_list, [[[len(Colour)]]])
+        self.assertRaises(ValueError, test_cube.set_cube, [[[Colour.RED]]])
+
+    def test_rotate_face(self):
+        other_faces = "RRRRRRRRRBBBBBBBBBOOOOOOOOOWWWWWWWWWYYYYYYYYY"
+        test_cube = CubeTextUI2D(3, string_repr="GRBOWYYOG" + other_faces)
+        cube_kernels.rotate_face(test_cube.get_cube(), 0, True)
+        expected_cube = CubeTextUI2D(3, string_repr="YOGOWRGYB" + other_faces)
+        self.assertEqual(test_cube, expected_cube, "Rotating a face clockwise doesn't work")
+
+        test_cube = CubeTextUI2D(3, string_repr="GRBOWYYOG" + other_faces)
+        cube_kernels.rotate_face(test_cube.get_cube(), 0, False)
+        expected_cube = CubeTextUI2D(3, string_repr="BYGRWOGOY" + other_faces)
+        self.assertEqual(test_cube, expected_cube, "Rotating a face anticlockwise doesn't work")
+
+    def test_apply_moves(self):
+        test_cube = CubeTextUI2D(4)
+        test_cube.apply_moves([
+            CubeTextUI2D.encode_move("x", 1, ColumnMove.UP),
+            CubeTextUI2D.encode_move("y", 2, RowMove.LEFT),
+            CubeTextUI2D.encode_move("z", 4, ColumnMove.DOWN),
+            CubeTextUI2D.encode_move("y", 4, RowMove.RIGHT)
+        ])
+        expected_cube = CubeTextUI2D(4)
+        expected_cube.rotate_x(1, ColumnMove.UP)
+        expected_cube.rotate_y(2, RowMove.LEFT)
+        expected_cube.rotate_z(4, ColumnMove.DOWN)
+        expected_cube.rotate_y(4, RowMove.RIGHT)
+        self.assertEqual(test_cube, expected_cube, "Applying a batch of encoded moves doesn't work")
+        self.assertRaises(ValueError, test_cube.apply_moves, [CubeTextUI2D.encode_move("x", 5, ColumnMove.UP)])
+        self.assertRaises(ValueError, test_cube.apply_moves, [-1])
+        self.assertRaises(ValueError, test_cube.apply_moves, [[0]])
+        self.assertRaises(ValueError, CubeTextUI2D.encode_move, "x", 1, RowMove.LEFT)
+        self.assertRaises(ValueError, CubeTextUI2D.encode_move, "y", 0, RowMove.LEFT)
+        self.assertRaises(ValueError, CubeTextUI2D.encode_move, "z", CubeTextUI2D.MAX_ENCODED_INDEX + 1, ColumnMove.UP)
+
+    def test_rotate_unchecked(self):
+        test_cube = CubeTextUI2D(3)
+        test_cube.rotate_x_unchecked(0, True)
+        test_cube.rotate_y_unchecked(2, False)
+        test_cube.rotate_z_unchecked(1, True)
+        expected_cube = CubeTextUI2D(3)
+        expected_cube.rotate_x(1, ColumnMove.UP)
+        expected_cube.rotate_y(3, RowMove.RIGHT)
+        expected_cube.rotate_z(2, ColumnMove.UP)
+        self.assertEqual(test_cube, expected_cube, "The unchecked rotate methods don't match the checked ones")
+
+    def test_apply_permutation(self):
+        test_cube = CubeTextUI2D(3)
+        test_cube.apply_permutation(test_cube.get_permutation(lambda: test_cube.rotate_y(1, RowMove.LEFT)))
         expected_cube = CubeTextUI2D(3)
-        self.assertEqual(test_cube, expected_cube, "Resetting the cube doesn't work")
+        expected_cube.rotate_y(1, RowMove.LEFT)
+        self.assertEqual(test_cube, expected_cube, "Applying a permutation from get_permutation doesn't work")
+        self.assertRaises(ValueError, CubeTextUI2D(1).apply_permutation, [100, 0, 0, 0, 0, 0])
+
+    def test_clone(self):
+        test_cube = CubeTextUI2D(3, string_repr=patterns[1][2])
+        cloned_cube = test_cube.clone()
+        self.assertEqual(cloned_cube, test_cube, "Cloning the cube doesn't give the same cube")
+        cloned_cube.rotate_x(1, ColumnMove.UP)
+        expected_cube = CubeTextUI2D(3, string_repr=patterns[1][2])
+        self.assertEqual(test_cube, expected_cube, "Rotating a cloned cube changes the original cube")
+        self.assertEqual(hash(test_cube), hash(expected_cube), "Equal cubes have different hashes")
+
+    def test_render_cube(self):
+        rendered_lines = CubeTextUI2D(2).render_cube().splitlines()
+        self.assertEqual(len(rendered_lines), 3 * 2 + 4, "The rendered net has the wrong number of lines")
+        self.assertEqual(rendered_lines[3], "╔=====╬=====╬=====╦=====╗", "The rendered net has the wrong separator")
 
 
 class TestCubeSimulator3x3(unittest.TestCase):
     def test_reset(self):
         test_cube = CubeTextUI2D(3, string_repr=patterns[0][2])  # Creating a cube with some arbitrary layout
         test_cube.reset()
-        expected_cube = CubeTextUI2D(3)
-        self.assertEqual(test_cube, expected_cube, "Resetting the cube doesn't work")
+        self.assertEqual(test_cube, _SOLVED_3, "Resetting the cube doesn't work")
 
     def test_patterns(self):
+        # Each pattern is undone, so the next starts from solved
+        test_sim = CubeSimulator3x3(CubeTextUI2D)
         for pattern_name, algorithm, expected_string in patterns:
-            test_sim = CubeSimulator3x3(CubeTextUI2D)
             test_sim.perform_moves(algorithm)
-            expected_cube = CubeTextUI2D(3, string_repr=expected_string)
+            expected_cube = _expected_cube(expected_string)
             self.assertEqual(test_sim.get_cube(), expected_cube,
                              f"The cubes do not match for pattern \"{pattern_name}\"")
             test_sim.undo_moves_sequence()
-            expected_cube.reset()
-            self.assertEqual(test_sim.get_cube(), expected_cube,
+            self.assertEqual(test_sim.get_cube(), _SOLVED_3,
                              f"Undoing pattern \"{pattern_name}\" did not reset the cube back to solved")
 
+    def test_get_scrambled_cubes(self):
+        test_sim = CubeSimulator3x3(CubeTextUI2D)
+        self.addCleanup(random.setstate, random.getstate())  # The scrambles use the shared random module
+        random.seed(0)
+        scrambled_cubes = test_sim.get_scrambled_cubes(4)
+        self.assertEqual(test_sim.get_cube(), _SOLVED_3, "Getting scrambled cubes changes the simulator's cube")
+        # Performing the same random moves one cube at a time should give the same cubes
+        random.seed(0)
+        moves = list(test_sim._get_move_permutations())
+        move_count = test_sim._SCRAMBLE_MOVE_COUNT
+        random_moves = random.choices(moves, k=4 * move_count)
+        for i, scrambled_cube in enumerate(scrambled_cubes):
+            test_sim.reset_cube()
+            test_sim.perform_moves("".join(random_moves[i * move_count:(i + 1) * move_count]))
+            self.assertEqual(scrambled_cube, test_sim.get_cube(), "A scrambled cube doesn't match its moves")
+
+        self.assertEqual(test_sim.get_scrambled_cubes(0), [], "Getting no scrambled cubes doesn't work")
+        self.assertRaises(ValueError, test_sim.get_scrambled_cubes, -1)
+
 
 class TestCubeGame(unittest.TestCase):
     def test_patterns(self):
+        # Each pattern is undone, so the next starts from solved
+        test_game = CubeGame2D(CubeSimulator3x3, CubeTextUI2D)
         for pattern_name, algorithm, expected_string in patterns:
-            test_game = CubeGame2D(CubeSimulator3x3, CubeTextUI2D)
             test_game._perform_moves(algorithm)
-            expected_cube = CubeTextUI2D(3, string_repr=expected_string)
+            expected_cube = _expected_cube(expected_string)
             self.assertEqual(test_game._simulator.get_cube(), expected_cube,
                              f"The cubes do not match for pattern \"{pattern_name}\"")
             test_game._undo_sequence()
-            expected_cube.reset()
-            self.assertEqual(test_game._simulator.get_cube(), expected_cube,
+            self.assertEqual(test_game._simulator.get_cube(), _SOLVED_3,
                              f"Undoing pattern \"{pattern_name}\" did not reset the cube back to solved")
 
 
+    def test_draw_frame(self):
+        test_game = CubeGame2D(CubeSimulator3x3, CubeTextUI2D)
+
+        def draw_frame(frame: list[str]) -> str:
+            """ Returns what the game writes to draw the frame given, on a terminal 20 columns wide. """
+            output = io.StringIO()
+            with mock.patch("shutil.get_terminal_size", return_value=os.terminal_size((20, 50))), \
+                    contextlib.redirect_stdout(output):
+                test_game._draw_frame(frame)
+            return output.getvalue()
+
+        wide_line = "b" * 25  # Wraps onto a second row
+        output = draw_frame(["a", wide_line, "c"])
+        self.assertTrue(output.startswith(CubeGame2D.CLEAR_SCREEN), "The first frame isn't drawn from scratch")
+        self.assertIn(f"\x1b[2;1H\x1b[2K{wide_line}\x1b[K", output, "A wrapped line isn't drawn properly")
+        self.assertIn("\x1b[4;1H\x1b[2Kc", output, "A line after a wrapped line isn't drawn on the right row")
+        self.assertTrue(output.endswith("\x1b[5;1H\x1b[J"), "The screen isn't erased below the frame")
+
+        output = draw_frame(["a", wide_line, "d"])
+        self.assertEqual(output, "\x1b[4;1H\x1b[2Kd\x1b[5;1H\x1b[J", "Only the changed line should be redrawn")
+
+        output = draw_frame(["a", "b", "d"])
+        self.assertEqual(output, "\x1b[2;1H\x1b[2Kb\x1b[3;1H\x1b[2Kd\x1b[4;1H\x1b[J",
+                         "A line that moved up a row isn't redrawn")
+
+
 if __name__ == '__main__':
     unittest.main()